@@ -7,6 +7,7 @@ import pandas as pd
 import streamlit as st
 
 import crops
+from pooled import PooledModel, price_engine
 
 # ----------------------------------------
 # PAGE CONFIG
@@ -69,6 +70,13 @@ class Commodity:
 # ----------------------------------------
 @st.cache_resource
 def load_models():
+    if price_engine() == "pooled":
+        pool = PooledModel.from_csv({
+            name: os.path.join(BASE_DIR, csv)
+            for name, csv in commodity_dict.items()
+        })
+        return {name: pool.commodity(name) for name in commodity_dict}
+
     models = {}
     for name, csv in commodity_dict.items():
         models[name] = Commodity(name, csv)
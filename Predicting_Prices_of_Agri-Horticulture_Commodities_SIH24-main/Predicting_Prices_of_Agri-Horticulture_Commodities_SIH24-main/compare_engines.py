@@ -0,0 +1,194 @@
+"""Compare the per-commodity trees against the pooled price model.
+
+Reports hold-out accuracy, memory footprint, startup time and batched
+forecast throughput for both engines over every CSV in ``static/``:
+
+    python compare_engines.py
+    python compare_engines.py --repeats 500 --seed 7
+    python compare_engines.py --depths 8 10 12
+"""
+import argparse
+import os
+import pickle
+import random
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.tree import DecisionTreeRegressor
+
+from pooled import PooledModel
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+
+ANNUAL_RAINFALL = [29, 21, 37.5, 30.7, 52.6, 150, 299, 251.7, 179.2, 70.5, 39.8, 10.9]
+
+
+# ----------------------------------------
+# ENGINES
+# ----------------------------------------
+def fit_trees(frames, max_depth=None):
+    # Same recipe as Commodity in streamlit_app.py, the app that serves every
+    # CSV: one tree per CSV, random depth unless one is given.
+    models = {}
+    for name, data in frames.items():
+        depth = max_depth or random.randint(7, 15)
+        model = DecisionTreeRegressor(max_depth=depth)
+        model.fit(data.iloc[:, :-1].values, data.iloc[:, 3].values)
+        models[name] = model
+    return models
+
+
+def fit_pooled(frames, max_depth=None):
+    if max_depth is None:
+        return PooledModel(frames)
+    return PooledModel(frames, max_depth=max_depth)
+
+
+def forecast_trees(models, rows):
+    return {
+        name: model.predict(np.array(rows))
+        for name, model in models.items()
+    }
+
+
+def forecast_pooled(pool, rows):
+    names = [name for name in pool.names for _ in rows]
+    months, years, rainfalls = np.array(rows * len(pool.names)).T
+    wpi = pool.predict_many(names, months, years, rainfalls)
+    return dict(zip(pool.names, wpi.reshape(len(pool.names), len(rows))))
+
+
+def fitted_trees(models):
+    return list(models.values())
+
+
+def fitted_pooled(pool):
+    return [pool.model]
+
+
+ENGINES = {
+    "tree": (fit_trees, forecast_trees, fitted_trees),
+    "pooled": (fit_pooled, forecast_pooled, fitted_pooled),
+}
+
+
+# ----------------------------------------
+# MEASUREMENTS
+# ----------------------------------------
+def load_frames():
+    return {
+        os.path.splitext(f)[0]: pd.read_csv(os.path.join(STATIC_DIR, f))
+        for f in sorted(os.listdir(STATIC_DIR))
+        if f.lower().endswith(".csv")
+    }
+
+
+def split(frames, seed):
+    train, test = {}, {}
+    for name, data in frames.items():
+        train[name], test[name] = train_test_split(
+            data, test_size=0.2, random_state=seed
+        )
+    return train, test
+
+
+def accuracy(engine, train, test, max_depth=None):
+    fit, _, fitted = ENGINES[engine]
+    models = fit(train, max_depth)
+
+    truth, preds = [], []
+    for name, data in test.items():
+        X = data.iloc[:, :-1].values
+        if engine == "tree":
+            pred = models[name].predict(X)
+        else:
+            pred = models.predict_many([name] * len(X), *X.T)
+        truth.append(data.iloc[:, 3].values)
+        preds.append(pred)
+    truth = np.concatenate(truth)
+    preds = np.concatenate(preds)
+
+    trees = fitted(models)
+    leaves = sum(tree.get_n_leaves() for tree in trees)
+    return r2_score(truth, preds), mean_absolute_error(truth, preds), leaves, len(pickle.dumps(trees))
+
+
+def startup(fit, runs):
+    # Reads the CSVs and fits, i.e. what load_models() pays on a cold start.
+    # Timed without tracemalloc, which slows allocation-heavy code a lot.
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        models = fit(load_frames())
+        best = min(best, time.perf_counter() - start)
+    return models, best
+
+
+def fit_peak(fit):
+    tracemalloc.start()
+    fit(load_frames())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def throughput(forecast, models, rows, repeats):
+    forecast(models, rows)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        forecast(models, rows)
+    elapsed = time.perf_counter() - start
+    return repeats / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=200,
+                        help="batched forecasts per engine (default: 200)")
+    parser.add_argument("--startup-runs", type=int, default=5,
+                        help="cold starts per engine, best is kept (default: 5)")
+    parser.add_argument("--depths", type=int, nargs="+", default=[6, 8, 10, 12, 15],
+                        help="max_depth values to sweep for both engines")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    frames = load_frames()
+    train, test = split(frames, args.seed)
+
+    # 12-month forecast from January 2025, as used for the forecast charts.
+    rows = [[m, 2025, ANNUAL_RAINFALL[m - 1]] for m in range(1, 13)]
+
+    print(f"{len(frames)} commodities, {sum(map(len, frames.values()))} rows, "
+          f"80/20 hold-out split per commodity (seed {args.seed})\n")
+
+    # Same max_depth for both engines, so the columns compare pooling rather
+    # than pruning.
+    print("Matched depth")
+    print(f"{'depth':>5} {'engine':<8} {'R2':>7} {'MAE':>7} {'leaves':>7} {'pickle KB':>10}")
+    for depth in args.depths:
+        for engine in ENGINES:
+            r2, mae, leaves, size = accuracy(engine, train, test, depth)
+            print(f"{depth:>5} {engine:<8} {r2:>7.4f} {mae:>7.2f} {leaves:>7} {size / 1024:>10.1f}")
+
+    # The engines as the apps build them: random 7-15 per commodity, pooled
+    # with its default depth.
+    print(f"\nAs shipped ({len(rows)}-month batched forecast x {args.repeats})")
+    print(f"{'engine':<8} {'models':>6} {'R2':>7} {'MAE':>7} {'pickle KB':>10} "
+          f"{'fit peak KB':>12} {'startup ms':>11} {'forecasts/s':>12}")
+    for engine, (fit, forecast, fitted) in ENGINES.items():
+        r2, mae, _, size = accuracy(engine, train, test)
+        models, elapsed = startup(fit, args.startup_runs)
+        peak = fit_peak(fit)
+        rate = throughput(forecast, models, rows, args.repeats)
+        print(f"{engine:<8} {len(fitted(models)):>6} {r2:>7.4f} {mae:>7.2f} {size / 1024:>10.1f} "
+              f"{peak / 1024:>12.1f} {elapsed * 1000:>11.1f} {rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
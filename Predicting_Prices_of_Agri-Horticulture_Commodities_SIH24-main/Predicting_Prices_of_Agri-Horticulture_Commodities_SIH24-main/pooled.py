@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeRegressor
+
+# ----------------------------------------
+# ENGINE SELECTION
+# ----------------------------------------
+# "tree"   -> one DecisionTreeRegressor per commodity CSV (default)
+# "pooled" -> one DecisionTreeRegressor over every CSV, commodity encoded
+ENGINE_ENV = "AGRINEXT_PRICE_ENGINE"
+ENGINES = ("tree", "pooled")
+
+
+def price_engine():
+    engine = os.environ.get(ENGINE_ENV, "tree").strip().lower()
+    if engine not in ENGINES:
+        raise ValueError(f"{ENGINE_ENV} must be one of {ENGINES}, got {engine!r}")
+    return engine
+
+
+# ----------------------------------------
+# POOLED MODEL
+# ----------------------------------------
+class PooledModel:
+    """Single price model trained on the union of the commodity CSVs.
+
+    The commodity is encoded as its mean training WPI, one more feature next
+    to month, year and rainfall. Unlike an alphabetical index, nearby values
+    mean similar price levels, so threshold splits group crops that price
+    alike and a shallow tree stays accurate.
+
+    ``max_depth=12`` was picked with ``compare_engines.py``: it is the
+    shallowest depth that beats the per-commodity trees on hold-out R2 and
+    MAE across seeds, with about three quarters of the leaves (and pickle
+    size) of the per-commodity trees together.
+    """
+
+    def __init__(self, frames, max_depth=12, random_state=None):
+        self.names = sorted(frames)
+        self.codes = {
+            name: frames[name].iloc[:, 3].mean() for name in self.names
+        }
+
+        X, Y = [], []
+        for name in self.names:
+            data = frames[name]
+            x = data.iloc[:, :-1].values
+            code = np.full((len(x), 1), self.codes[name])
+            X.append(np.hstack([code, x]))
+            Y.append(data.iloc[:, 3].values)
+
+        self.X = np.vstack(X)
+        self.Y = np.concatenate(Y)
+
+        self.model = DecisionTreeRegressor(
+            max_depth=max_depth, random_state=random_state
+        )
+        self.model.fit(self.X, self.Y)
+
+    @classmethod
+    def from_csv(cls, csv_paths, **kwargs):
+        frames = {name: pd.read_csv(path) for name, path in csv_paths.items()}
+        return cls(frames, **kwargs)
+
+    @classmethod
+    def from_dir(cls, static_dir, **kwargs):
+        csv_paths = {
+            os.path.splitext(f)[0]: os.path.join(static_dir, f)
+            for f in os.listdir(static_dir)
+            if f.lower().endswith(".csv")
+        }
+        return cls.from_csv(csv_paths, **kwargs)
+
+    def predict_many(self, names, months, years, rainfalls):
+        codes = [self.codes[name] for name in names]
+        value = np.column_stack([codes, months, years, rainfalls])
+        return self.model.predict(value)
+
+    def commodity(self, name):
+        return PooledCommodity(self, name)
+
+
+class PooledCommodity:
+    """Per-commodity view of a ``PooledModel``.
+
+    Exposes the same ``predict(month, year, rainfall)`` as ``Commodity`` so
+    the apps can swap engines without touching the UI code.
+    """
+
+    def __init__(self, pool, name):
+        if name not in pool.codes:
+            raise KeyError(f"{name!r} is not in the pooled model")
+        self.pool = pool
+        self.name = name
+
+    def predict(self, month, year, rainfall):
+        return self.pool.predict_many([self.name], [month], [year], [rainfall])[0]
@@ -6,6 +6,8 @@ import os
 import altair as alt
 from sklearn.tree import DecisionTreeRegressor
 
+from pooled import PooledModel, price_engine
+
 # -------------------------------------------------
 # PAGE CONFIG
 # -------------------------------------------------
@@ -76,7 +78,19 @@ class Commodity:
 # CACHE MODEL
 # -------------------------------------------------
 @st.cache_resource
+def load_pool():
+    return PooledModel.from_dir(STATIC_DIR)
+
+
 def load_model(csv_path):
+    if price_engine() == "pooled":
+        crop_name = os.path.splitext(os.path.basename(csv_path))[0]
+        return load_pool().commodity(crop_name)
+    return load_commodity(csv_path)
+
+
+@st.cache_resource
+def load_commodity(csv_path):
     return Commodity(csv_path)
 
 # -------------------------------------------------
@@ -0,0 +1,456 @@
+"""Headless concurrent-session load test for the AgriNext Streamlit apps.
+
+Drives every app with Streamlit's ``AppTest`` from N threads at once, the
+same way a single ``streamlit run`` server serves N browser tabs: one
+process, shared ``st.cache_resource`` entries, shared working directory.
+Each session runs a scripted set of interactions and every rerun is timed.
+
+Per app it reports rerun latency percentiles, throughput, CPU time and
+peak RSS, and it flags concurrency bugs:
+
+* an exception or `st.error` message raised by any rerun,
+* two sessions getting different results for the same inputs,
+* a session reading back a file that another session overwrote. Sessions
+  meet at a barrier after writing, so this is caught on every run, not
+  only when thread timing happens to interleave.
+
+Each app runs from its own directory. The disease app needs tensorflow and
+``trained_plant_disease_model.keras`` (not shipped in the repo); without
+them it is reported as skipped rather than failed.
+
+Everything runs offline. The exit code is non-zero if any bug is found or
+a ``--max-*``/``--min-*`` budget is missed, so it can gate regressions:
+
+    python loadtest.py
+    python loadtest.py --app price --sessions 16 --iterations 5
+    python loadtest.py --max-p95-ms 1500 --json loadtest.json
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PRICE_DIR = os.path.join(
+    ROOT,
+    "Predicting_Prices_of_Agri-Horticulture_Commodities_SIH24-main",
+    "Predicting_Prices_of_Agri-Horticulture_Commodities_SIH24-main",
+)
+DISEASE_DIR = os.path.join(ROOT, "PLANT-DISEASE-IDENTIFICATION")
+CROP_DIR = os.path.join(ROOT, "CROP-RECOMMENDATION")
+
+# main.py saves every upload to this one path in the working directory and
+# predicts from it.
+UPLOAD_TEMP = "uploaded_temp.jpg"
+DISEASE_MODEL = "trained_plant_disease_model.keras"
+
+
+# -----------------------------------------------------------
+# SCENARIOS
+# -----------------------------------------------------------
+# A scenario is a script, a generator of interactions (each a list of steps)
+# and an optional check that returns why the app cannot run here. Steps get
+# the session index and a Rendezvous shared by all sessions. Every step
+# drives the AppTest into one rerun and returns (key, observed, expected):
+#   key       -> inputs of the step; equal keys must give equal ``observed``
+#   expected  -> if not None, ``observed`` must equal it in this session
+def crop_steps(rng, index, rendezvous):
+    df = pd.read_csv(os.path.join(CROP_DIR, "Crop_recommendation.csv"))
+    columns = ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"]
+
+    while True:
+        row = df.iloc[rng.randrange(len(df))][columns].tolist()
+
+        def predict(at, row=row):
+            for widget, value in zip(at.sidebar.number_input, row):
+                widget.set_value(float(value))
+            at.sidebar.button[0].click().run()
+            return tuple(row), [s.value for s in at.success], None
+
+        yield [predict]
+
+
+def price_steps(rng, index, rendezvous):
+    crops = sorted(
+        os.path.splitext(f)[0]
+        for f in os.listdir(os.path.join(PRICE_DIR, "static"))
+        if f.lower().endswith(".csv")
+    )
+
+    while True:
+        crop, month, year = rng.choice(crops), rng.randint(1, 12), rng.randint(2024, 2030)
+
+        def select(at, crop=crop, month=month, year=year):
+            at.selectbox[0].set_value(crop)
+            at.selectbox[1].set_value(month)
+            at.selectbox[2].set_value(year)
+            at.run()
+            return None, None, None
+
+        def predict(at, crop=crop, month=month, year=year):
+            at.button[0].click().run()
+            return (crop, month, year), [m.value for m in at.metric], None
+
+        yield [select, predict]
+
+
+def disease_steps(rng, index, rendezvous):
+    test_dir = os.path.join(DISEASE_DIR, "test")
+    images = sorted(
+        f for f in os.listdir(test_dir)
+        if f.lower().endswith((".jpg", ".jpeg", ".png"))
+    )
+
+    def open_page(at):
+        at.selectbox[0].set_value("DISEASE RECOGNITION").run()
+        return None, None, None
+
+    steps = [open_page]
+    for k in count():
+        # Distinct images per session, so an overwrite always shows up.
+        name = images[(index + k) % len(images)]
+        with open(os.path.join(test_dir, name), "rb") as f:
+            content = f.read()
+
+        def upload(at, name=name, content=content):
+            at.file_uploader[0].set_value((name, content, "image/jpeg")).run()
+            # Read back only once every session has saved its upload.
+            rendezvous.wait()
+            with open(UPLOAD_TEMP, "rb") as f:
+                saved = hashlib.sha1(f.read()).hexdigest()
+            return None, saved, hashlib.sha1(content).hexdigest()
+
+        def detect(at, name=name):
+            at.button[0].click().run()
+            shown = [m.value for m in at.markdown if "Predicted" in m.value]
+            if not shown and not at.error:
+                raise RuntimeError(f"no prediction rendered for {name}")
+            return name, shown, None
+
+        yield steps + [upload, detect]
+        steps = []
+
+
+def disease_unavailable():
+    if importlib.util.find_spec("tensorflow") is None:
+        return "tensorflow is not installed"
+    # main.py looks for its model with os.walk(".") from DISEASE_DIR.
+    for _, _, files in os.walk(DISEASE_DIR):
+        if DISEASE_MODEL in files:
+            return None
+    return f"{DISEASE_MODEL} not found under {os.path.relpath(DISEASE_DIR, ROOT)}/"
+
+
+SCENARIOS = {
+    "crop": (os.path.join(CROP_DIR, "webapp.py"), crop_steps, None),
+    "price": (os.path.join(PRICE_DIR, "streamlit_app.py"), price_steps, None),
+    "disease": (os.path.join(DISEASE_DIR, "main.py"), disease_steps, disease_unavailable),
+}
+
+
+# -----------------------------------------------------------
+# CONCURRENT APPTEST
+# -----------------------------------------------------------
+def shared_runtime():
+    """Share one runtime between every session in this process.
+
+    ``AppTest`` builds a mock runtime, stores it on ``Runtime._instance``
+    for the rerun and resets it to ``None`` afterwards, which breaks as soon
+    as two sessions rerun at once. Point ``AppTest`` at a subclass that
+    keeps the first runtime ``AppTest`` builds on ``Runtime`` itself and
+    ignores the resets, like a real server with one runtime. The runtime is
+    AppTest's own, so it matches whatever the installed Streamlit sets up.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test
+
+    if getattr(app_test, "Runtime", None) is not Runtime or not hasattr(Runtime, "_instance"):
+        raise RuntimeError(
+            "streamlit.testing.v1.app_test no longer sets Runtime._instance; "
+            "shared_runtime() needs updating for this Streamlit version"
+        )
+
+    lock = threading.Lock()
+
+    class Capture(type(Runtime)):
+        def __setattr__(cls, name, value):
+            if name != "_instance":
+                super().__setattr__(name, value)
+            elif value is not None:
+                with lock:
+                    if Runtime._instance is None:
+                        Runtime._instance = value
+
+    app_test.Runtime = Capture("AppTestRuntime", (Runtime,), {})
+
+    # Overlapping patch_config_options() calls restore each other's values.
+    config.set_option("global.appTest", True)
+
+
+class Rendezvous:
+    """Barrier for all sessions of one app that survives sessions dying.
+
+    A session that stops early aborts the barrier so the others are not
+    left waiting; by then the run already has an error to report.
+    """
+
+    def __init__(self, sessions):
+        self.barrier = threading.Barrier(sessions)
+
+    def wait(self):
+        try:
+            self.barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+
+    def leave(self):
+        self.barrier.abort()
+
+
+class PeakRSS(threading.Thread):
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0
+        self.done = threading.Event()
+
+    def sample(self):
+        try:
+            with open("/proc/self/statm") as f:
+                pages = int(f.read().split()[1])
+            self.peak = max(self.peak, pages * os.sysconf("SC_PAGE_SIZE"))
+        except OSError:
+            # No procfs: fall back to the process high-water mark.
+            import resource
+
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak = max(self.peak, peak * (1 if sys.platform == "darwin" else 1024))
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        self.sample()
+        return self.peak
+
+
+def session(script, steps, index, rendezvous, seed, iterations, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    latencies, errors, observations = [], [], []
+    rng = random.Random(seed)
+    at = AppTest.from_file(script, default_timeout=timeout)
+
+    def load(at):
+        at.run()
+        return None, None, None
+
+    def timed(step):
+        start = time.perf_counter()
+        try:
+            key, observed, expected = step(at)
+        except Exception as e:
+            latencies.append(time.perf_counter() - start)
+            errors.append(f"{type(e).__name__}: {e}")
+            return False
+        latencies.append(time.perf_counter() - start)
+        # st.error output means the app took its failure path (e.g. main.py
+        # without its model), so the rerun did not measure real work.
+        if at.exception or at.error:
+            errors.extend(e.message for e in at.exception)
+            errors.extend(e.value for e in at.error)
+            return False
+        if key is not None or expected is not None:
+            observations.append((key, observed, expected))
+        return True
+
+    finished = False
+    if timed(load):
+        for interaction in islice(steps(rng, index, rendezvous), iterations):
+            if not all(timed(step) for step in interaction):
+                break
+        else:
+            finished = True
+    if not finished:
+        rendezvous.leave()
+
+    return latencies, errors, observations
+
+
+def run_app(name, sessions, iterations, timeout, seed):
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    # Uncaught app errors are collected from AppTest instead of logged.
+    config.set_option("logger.level", "critical")
+    set_log_level("critical")
+    from streamlit.runtime import Runtime
+
+    shared_runtime()
+
+    script, steps, _ = SCENARIOS[name]
+    os.chdir(os.path.dirname(script))
+    rendezvous = Rendezvous(sessions)
+
+    # Sessions overwrite UPLOAD_TEMP; put back whatever was there before.
+    backup = None
+    if os.path.isfile(UPLOAD_TEMP):
+        with open(UPLOAD_TEMP, "rb") as f:
+            backup = f.read()
+
+    try:
+        rss = PeakRSS()
+        rss.start()
+        cpu = time.process_time()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            results = list(pool.map(
+                lambda i: session(
+                    script, steps, i, rendezvous, seed + i, iterations, timeout
+                ),
+                range(sessions),
+            ))
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+        peak = rss.stop()
+    finally:
+        if backup is not None:
+            with open(UPLOAD_TEMP, "wb") as f:
+                f.write(backup)
+        elif os.path.isfile(UPLOAD_TEMP):
+            os.remove(UPLOAD_TEMP)
+
+    if Runtime._instance is None:
+        raise RuntimeError(
+            "AppTest never installed a runtime; shared_runtime() needs "
+            "updating for this Streamlit version"
+        )
+
+    latencies = np.array([t for r in results for t in r[0]]) * 1000
+    errors = sorted({e for r in results for e in r[1]})
+
+    issues, seen = [], {}
+    for i, (_, _, observations) in enumerate(results):
+        for key, observed, expected in observations:
+            if expected is not None and observed != expected:
+                issues.append(f"session {i}: read back another session's data ({observed[:12]} != {expected[:12]})")
+            if key is not None:
+                first = seen.setdefault(key, (i, observed))
+                if first[1] != observed:
+                    issues.append(f"session {i}: {key} gave {observed}, session {first[0]} gave {first[1]}")
+
+    return {
+        "app": name,
+        "script": os.path.relpath(script, ROOT),
+        "sessions": sessions,
+        "reruns": int(latencies.size),
+        "wall_s": wall,
+        "throughput_rps": latencies.size / wall if wall else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+        "p90_ms": float(np.percentile(latencies, 90)) if latencies.size else 0.0,
+        "p95_ms": float(np.percentile(latencies, 95)) if latencies.size else 0.0,
+        "p99_ms": float(np.percentile(latencies, 99)) if latencies.size else 0.0,
+        "max_ms": float(latencies.max()) if latencies.size else 0.0,
+        "cpu_s": cpu,
+        "cpu_pct": 100 * cpu / wall if wall else 0.0,
+        "peak_rss_mb": peak / 2**20,
+        "errors": errors,
+        "concurrency_issues": sorted(set(issues)),
+    }
+
+
+# -----------------------------------------------------------
+# REPORT
+# -----------------------------------------------------------
+def budget_failures(report, args):
+    failures = []
+    if report["errors"]:
+        failures.append(f"{len(report['errors'])} error(s)")
+    if report["concurrency_issues"]:
+        failures.append(f"{len(report['concurrency_issues'])} concurrency issue(s)")
+    if args.max_p95_ms is not None and report["p95_ms"] > args.max_p95_ms:
+        failures.append(f"p95 {report['p95_ms']:.0f} ms > {args.max_p95_ms:.0f} ms")
+    if args.min_throughput is not None and report["throughput_rps"] < args.min_throughput:
+        failures.append(f"throughput {report['throughput_rps']:.2f}/s < {args.min_throughput:.2f}/s")
+    if args.max_rss_mb is not None and report["peak_rss_mb"] > args.max_rss_mb:
+        failures.append(f"peak RSS {report['peak_rss_mb']:.0f} MB > {args.max_rss_mb:.0f} MB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", choices=sorted(SCENARIOS), action="append",
+                        help="app to test, repeatable (default: all)")
+    parser.add_argument("--sessions", type=int, default=8,
+                        help="concurrent sessions per app (default: 8)")
+    parser.add_argument("--iterations", type=int, default=3,
+                        help="scripted interactions per session (default: 3)")
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="seconds allowed per rerun (default: 60)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-p95-ms", type=float)
+    parser.add_argument("--min-throughput", type=float, help="reruns per second")
+    parser.add_argument("--max-rss-mb", type=float)
+    parser.add_argument("--json", help="write the reports to this file")
+    args = parser.parse_args()
+
+    # One fresh process per app: cold caches and a clean RSS baseline.
+    ctx = multiprocessing.get_context("spawn")
+    reports, skipped = [], []
+    for name in args.app or sorted(SCENARIOS):
+        script, _, unavailable = SCENARIOS[name]
+        reason = unavailable and unavailable()
+        if reason:
+            skipped.append({
+                "app": name,
+                "script": os.path.relpath(script, ROOT),
+                "skipped": reason,
+            })
+            continue
+        with ctx.Pool(1) as pool:
+            reports.append(pool.apply(
+                run_app, (name, args.sessions, args.iterations, args.timeout, args.seed)
+            ))
+
+    failed = False
+    print(f"{'app':<8} {'reruns':>6} {'rerun/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'CPU s':>7} {'CPU %':>6} {'RSS MB':>7}")
+    for r in reports:
+        print(f"{r['app']:<8} {r['reruns']:>6} {r['throughput_rps']:>8.2f} "
+              f"{r['p50_ms']:>8.0f} {r['p95_ms']:>8.0f} {r['p99_ms']:>8.0f} "
+              f"{r['max_ms']:>8.0f} {r['cpu_s']:>7.1f} {r['cpu_pct']:>6.0f} "
+              f"{r['peak_rss_mb']:>7.0f}")
+    for r in reports:
+        r["failures"] = budget_failures(r, args)
+        if r["failures"]:
+            failed = True
+            print(f"\n[FAIL] {r['app']} ({r['script']}): {', '.join(r['failures'])}")
+            for line in r["errors"] + r["concurrency_issues"]:
+                print(f"  - {line}")
+    for r in skipped:
+        print(f"\n[SKIP] {r['app']} ({r['script']}): {r['skipped']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports + skipped, f, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()